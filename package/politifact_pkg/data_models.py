@@ -5,12 +5,14 @@ Example fact check:
 - https://www.politifact.com/factchecks/2007/oct/02/mike-gravel/yes-in-theory-but-not-in-practice/
 """
 import re
-import requests
+import lxml.html
 
-from bs4 import BeautifulSoup
 from datetime import datetime
+from lxml import etree
 from urllib.parse import urlparse
 
+from .parsing import HTML_PARSER, xpath_has_class
+
 # Define the components of the date pattern using f-strings
 MONTH_NAMES = "|".join(
     [
@@ -35,14 +37,63 @@ YEAR_PATTERN = r"\d{4}"
 # Use an f-string to construct the final date pattern
 DATE_PATTERN = rf"\b(?:{MONTH_NAMES})\s+{DAY_PATTERN},\s+{YEAR_PATTERN}"
 
+# Characters BeautifulSoup treats as whitespace when collapsing text nodes
+ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+# XPath queries are compiled once and shared by every fact check
+FACTCHECKER_XP = etree.XPath(f"//div[{xpath_has_class('m-author__content')}]")
+VERDICT_IMAGE_SRC_XP = etree.XPath(
+    f"//img[{xpath_has_class('c-image__original')}]/@src", smart_strings=False
+)
+STATEMENT_XP = etree.XPath(f"//div[{xpath_has_class('m-statement__quote')}]")
+STATEMENT_ORIGINATOR_XP = etree.XPath(
+    f"//a[{xpath_has_class('m-statement__name')}]/@title", smart_strings=False
+)
+STATEMENT_DESC_XP = etree.XPath(f"//div[{xpath_has_class('m-statement__desc')}]")
+TOPIC_XP = etree.XPath(
+    "(//ul[@class='m-list m-list--horizontal'])[1]"
+    f"//li[{xpath_has_class('m-list__item')}]/descendant::span[1]"
+)
+
+
+def get_text(element):
+    """
+    Return the text of an lxml element the way BeautifulSoup's `.text` does.
+
+    BeautifulSoup replaces every whitespace-only text node with a single "\n"
+    (or " " if it has no newline). Doing the same keeps the extracted values
+    identical to fact checks scraped before the switch to lxml.
+    """
+    text_nodes = []
+    for text in element.itertext():
+        if text.strip(ASCII_SPACES):
+            text_nodes.append(text)
+        else:
+            text_nodes.append("\n" if "\n" in text else " ")
+    return "".join(text_nodes)
+
 
 class PolitiFactCheck:
-    def __init__(self, response=None, link=None):
+    __slots__ = (
+        "_doc",
+        "_factchecker_tag",
+        "verdict",
+        "statement",
+        "statement_originator",
+        "statement_date",
+        "factchecker_name",
+        "factcheck_date",
+        "topics",
+        "factcheck_analysis_link",
+        "date_retrieved",
+    )
+
+    def __init__(self, html=None, link=None):
         """
-        Ingest a requests.models.Response object for a PolitiFact factchecking page.
+        Ingest the raw HTML bytes of a PolitiFact factchecking page.
         """
-        if not isinstance(response, requests.models.Response):
-            raise TypeError(f"`response` must be of type `requests.models.Response`")
+        if not isinstance(html, bytes):
+            raise TypeError(f"`html` must be bytes")
         if not isinstance(link, str):
             raise TypeError(f"`link` must be a string")
 
@@ -51,8 +102,7 @@ class PolitiFactCheck:
             raise TypeError("`link` must be a valid URL")
 
         # Internal proporties
-        self._text = response.text
-        self._soup = BeautifulSoup(self._text, parser="html.parser", features="lxml")
+        self._doc = lxml.html.fromstring(html, parser=HTML_PARSER)
         self._factchecker_tag = self._get_factchecker_tag()
 
         # Public properties
@@ -66,25 +116,47 @@ class PolitiFactCheck:
         self.factcheck_analysis_link = link
         self.date_retrieved = datetime.utcnow().timestamp()
 
+    @classmethod
+    def from_html(cls, html, link):
+        """
+        Return the public properties of the fact check in `html` as a dict.
+
+        Only plain data is returned, so the result is cheap to send back from
+        a worker process.
+        """
+        return cls(html=html, link=link).to_dict()
+
+    def to_dict(self):
+        """Return the public properties of the fact check as a dict"""
+        return {
+            "verdict": self.verdict,
+            "statement": self.statement,
+            "statement_originator": self.statement_originator,
+            "statement_date": self.statement_date,
+            "factchecker_name": self.factchecker_name,
+            "factcheck_date": self.factcheck_date,
+            "topics": self.topics,
+            "factcheck_analysis_link": self.factcheck_analysis_link,
+            "date_retrieved": self.date_retrieved,
+        }
+
     def _get_factchecker_tag(self):
         """Return the entire fact checker tag"""
-        return self._soup.find("div", attrs={"class": "m-author__content"})
+        return FACTCHECKER_XP(self._doc)[0]
 
     def _get_factchecker_name(self):
         """Return the fact checkers name"""
-        return self._factchecker_tag.find("a").text
+        return get_text(self._factchecker_tag.find(".//a"))
 
     def _get_factcheck_date(self):
         """Return the date of the fact check"""
-        text = self._factchecker_tag.find("span").text
+        text = get_text(self._factchecker_tag.find(".//span"))
         return self._extract_date_string(text)
 
     def _get_verdict(self):
         """Return the fact-checking verdict"""
-        images = self._soup.find_all("img", attrs={"class": "c-image__original"})
-        for image in images:
-            verdict_image_link = image.get("src")
-            if verdict_image_link and "rulings" in verdict_image_link:
+        for verdict_image_link in VERDICT_IMAGE_SRC_XP(self._doc):
+            if "rulings" in verdict_image_link:
                 # Return the first image containing "rulings"
                 # URL example: https://static.politifact.com/politifact/rulings/meter-mostly-false.jpg
                 basename = verdict_image_link.split("/")[-1]
@@ -92,17 +164,15 @@ class PolitiFactCheck:
 
     def _get_statement(self):
         """Return the statement"""
-        return self._soup.find(
-            "div", attrs={"class": "m-statement__quote"}
-        ).text.replace("\n", "")
+        return get_text(STATEMENT_XP(self._doc)[0]).replace("\n", "")
 
     def _get_statement_originator(self):
         """Return the statement originator"""
-        return self._soup.find("a", attrs={"class": "m-statement__name"}).get("title")
+        return STATEMENT_ORIGINATOR_XP(self._doc)[0]
 
     def _get_statement_date(self):
         """Return the date the statement was made."""
-        text = self._soup.find("div", attrs={"class": "m-statement__desc"}).text
+        text = get_text(STATEMENT_DESC_XP(self._doc)[0])
         return self._extract_date_string(text)
 
     def _extract_date_string(self, string):
@@ -122,11 +192,5 @@ class PolitiFactCheck:
 
     def _get_topics(self, delimiter="|"):
         """Return the topics of the fact check"""
-        topic_list = self._soup.find(
-            "ul", attrs={"class": "m-list m-list--horizontal"}
-        ).find_all("li", attrs={"class": "m-list__item"})
-
-        topics = []
-        for topic_item in topic_list:
-            topics.append(topic_item.find("span").text)
+        topics = [get_text(topic) for topic in TOPIC_XP(self._doc)]
         return f"{delimiter}".join(topics)
@@ -1,41 +1,67 @@
 """
 Functions for parsing PolitiFact webpages.
 """
-import requests
+import lxml.html
 
-from bs4 import BeautifulSoup
+from lxml import etree
 
 
-def find_no_results(soup):
+def xpath_has_class(name):
+    """
+    Return an XPath predicate matching elements that have the CSS class `name`.
+
+    Parameters:
+    ----------
+    - name (str): The CSS class name.
+
+    Returns:
+    ----------
+    - str: The XPath predicate, to be used within square brackets.
+    """
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# PolitiFact serves UTF-8, so pages are parsed straight from the response bytes
+# without guessing the encoding or decoding them to str first
+HTML_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+
+# Compiled once at import and reused for every page
+NO_RESULTS_XP = etree.XPath(
+    f"(//h2[{xpath_has_class('c-title')} and {xpath_has_class('c-title--subline')}])"
+    "[1][contains(., 'No Results found')]"
+)
+# The non-empty href of the first link within each statement quote
+STATEMENT_LINK_XP = etree.XPath(
+    f"//div[{xpath_has_class('m-statement__quote')}]/descendant::a[1]/@href[. != '']",
+    smart_strings=False,
+)
+
+
+def find_no_results(html):
     """
     Check if a politifact page has no results.
 
     Parameters:
     ----------
-    - soup (BeautifulSoup): HTML content of the webpage.
+    - html (bytes): Raw HTML content of the webpage.
 
     Returns:
     ----------
     - bool: True if the page has no results, False otherwise.
     """
-    # Find the <h2> element with the specified class.
-    h2_element = soup.find("h2", class_="c-title c-title--subline")
-
-    # Check if the element exists and contains the expected text.
-    if h2_element and "No Results found" in h2_element.get_text():
-        return True
-    else:
-        return False
+    # Find the <h2> element with the specified class, if it contains the
+    # expected text.
+    h2_elements = NO_RESULTS_XP(lxml.html.fromstring(html, parser=HTML_PARSER))
+    return bool(h2_elements)
 
 
-def extract_statement_links(response, url_base):
+def extract_statement_links(html):
     """
-    Extracts links from requests.models.Response object from politifact.
+    Extracts the fact check links from a politifact listing page.
 
     Parameters:
     ----------
-    - response (requests.models.Response): HTML content of the webpage.
-    - url_base (str): The base URL used to construct the politifact URLs.
+    - html (bytes): Raw HTML content of the webpage.
 
     Returns:
     ----------
@@ -45,26 +71,14 @@ def extract_statement_links(response, url_base):
     ----------
     - TypeError
     """
-    if not isinstance(response, requests.models.Response):
-        raise TypeError(f"`response` must be of type `requests.models.Response`")
-    if not response.url.startswith(url_base):
-        raise TypeError(
-            f"`response` URL must start with {url_base}. "
-            f"Currently URL is: {response.url}"
-        )
+    if not isinstance(html, bytes):
+        raise TypeError("`html` must be of type `bytes`")
 
     statement_links = []
-    if response:
-        html_text = response.text
-        soup = BeautifulSoup(html_text, "html.parser")
-
-        # Find all elements with the "m_statement__quote" class
-        statement_divs = soup.find_all("div", attrs={"class": "m-statement__quote"})
-
-        for element in statement_divs:
-            # Extract the href attribute if it exists
-            href = element.find("a").get("href")
-            if href:
-                statement_links.append(href)
+    if html:
+        tree = lxml.html.fromstring(html, parser=HTML_PARSER)
+
+        # Extract the link of every element with the "m_statement__quote" class
+        statement_links = STATEMENT_LINK_XP(tree)
 
     return statement_links
@@ -1,25 +1,116 @@
 """
 Convenience functions for scraping the PolitiFact data.
 """
+import asyncio
+import httpx
+import logging
 import random
 import requests
 import time
 
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
+from urllib3.util import Retry
 
 from politifact_pkg.parsing import find_no_results
 
+logger = logging.getLogger(__name__)
+
+# (connect, read) timeouts in seconds for every request
+REQUEST_TIMEOUT = (5, 30)
+
+# Returned by `fetch_url_async` when the server says a page has not changed
+NOT_MODIFIED = object()
+
+# Only advertise Brotli when a decoder is installed, otherwise responses would
+# come back compressed in a format that requests/httpx cannot decode.
+try:
+    import brotli  # noqa: F401
+
+    ACCEPT_ENCODING = "br, gzip, deflate"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+
+        ACCEPT_ENCODING = "br, gzip, deflate"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+# Headers sent with every request, by both the sync and async clients. Both
+# keep connections alive by default, and HTTP/2 forbids a "Connection" header.
+DEFAULT_HEADERS = {
+    "User-Agent": "politifact-scraper (https://github.com/mr-devs/politifact-scraper)",
+    "Accept-Encoding": ACCEPT_ENCODING,
+}
+
+# A single session is shared by all requests so that the keep-alive connection
+# to politifact.com is reused instead of re-negotiating TCP + TLS every time.
+# Retries are handled by `fetch_url`, so the adapter does not retry on its own.
+SESSION = requests.Session()
+SESSION.headers.update(DEFAULT_HEADERS)
+_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=10, max_retries=Retry(total=0))
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
+
+def get_retry_wait_time(attempt, retry_delay, response=None):
+    """
+    Return the number of seconds to wait before retrying a failed request.
+
+    A numeric Retry-After header on the failed response is honored. Otherwise,
+    the wait grows exponentially with each attempt, plus up to a second of jitter.
+
+    Parameters
+    ----------
+    - attempt (int): The zero-based number of the attempt that failed.
+    - retry_delay (int): Base number of seconds to wait between retries.
+    - response: The failed requests/httpx response, if the server answered.
+
+    Returns
+    ----------
+    - float: The number of seconds to wait.
+    """
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return int(retry_after)
+
+    return retry_delay * 2**attempt + random.uniform(0, 1)
+
+
+def is_retryable(response=None):
+    """
+    Return whether a failed request is worth retrying.
+
+    Network errors, server errors (5xx) and rate limiting (429) are transient.
+    Other HTTP errors, such as 404 or an unfollowed redirect, will not go away
+    by retrying.
+
+    Parameters
+    ----------
+    - response: The failed requests/httpx response, if the server answered.
+
+    Returns
+    ----------
+    - bool: True if the request should be retried, False otherwise.
+    """
+    if response is None:
+        return True
+    return response.status_code >= 500 or response.status_code == 429
+
 
 def fetch_url(url, max_retries=7, retry_delay=2):
     """
     Fetches data for a provided web URL.
 
+    Failed attempts are retried with exponential backoff, except for non-transient
+    HTTP errors (3xx/4xx other than 429), which fail immediately.
+
     Parameters
     ----------
     - url (str): The URL of the webpage.
     - max_retries (int): Maximum number of retries in case of failure.
-    - retry_delay (int): Number of seconds to wait between retries.
+    - retry_delay (int): Base number of seconds to wait between retries.
 
     Returns
     ----------
@@ -38,63 +129,164 @@ def fetch_url(url, max_retries=7, retry_delay=2):
 
     for attempt in range(max_retries):
         try:
-            response = requests.get(url)
+            response = SESSION.get(url, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()  # Raise an exception for HTTP errors
             return response
 
         except RequestException as e:
             if isinstance(e, requests.ConnectionError):
                 # Handle network-related errors
-                print(f"Attempt {attempt + 1} failed due to a network error: {e}")
+                logger.warning(
+                    "Attempt %d failed due to a network error: %s", attempt + 1, e
+                )
             elif isinstance(e, requests.Timeout):
                 # Handle timeout errors
-                print(f"Attempt {attempt + 1} timed out: {e}")
+                logger.warning("Attempt %d timed out: %s", attempt + 1, e)
             else:
                 # Handle other RequestException errors
-                print(f"Attempt {attempt + 1} failed with an unknown error: {e}")
+                logger.warning(
+                    "Attempt %d failed with an unknown error: %s", attempt + 1, e
+                )
+
+            if not is_retryable(e.response):
+                logger.error(
+                    "Not retrying HTTP %d for %s.", e.response.status_code, url
+                )
+                return None
 
             if attempt < max_retries - 1:
-                wait_time = retry_delay * attempt
-                print(f"Retrying in {wait_time} seconds...")
+                wait_time = get_retry_wait_time(attempt, retry_delay, e.response)
+                logger.warning("Retrying in %.1f seconds...", wait_time)
                 time.sleep(wait_time)
             else:
-                print("Max retries reached. Failed to fetch the webpage.")
+                logger.error("Max retries reached. Failed to fetch the webpage.")
                 return None
 
 
-def find_max_page(base_url, max_page):
+async def fetch_url_async(client, url, validators=None, max_retries=7, retry_delay=2):
+    """
+    Asynchronously fetches the HTML of a provided web URL.
+
+    Failed attempts are retried with exponential backoff, except for non-transient
+    HTTP errors (3xx/4xx other than 429), which fail immediately. If `validators` from
+    a previous fetch are provided, a conditional request is made and
+    `NOT_MODIFIED` is returned in place of the HTML when the page is unchanged.
+
+    Parameters
+    ----------
+    - client (httpx.AsyncClient): The client used to make the request.
+    - url (str): The URL of the webpage.
+    - validators (dict): The "etag" and "last_modified" values of a previous fetch.
+    - max_retries (int): Maximum number of retries in case of failure.
+    - retry_delay (int): Base number of seconds to wait between retries.
+
+    Returns
+    ----------
+    - tuple: The raw HTML bytes of the webpage (None in case of failure, or
+        `NOT_MODIFIED`) and a dict with the response's "etag" and "last_modified".
+
+    Exceptions
+    ----------
+    - TypeError
+    """
+    if not isinstance(client, httpx.AsyncClient):
+        raise TypeError("`client` must be of type `httpx.AsyncClient`")
+    if not isinstance(url, str):
+        raise TypeError("`url` must be a string")
+    if validators is not None and not isinstance(validators, dict):
+        raise TypeError("`validators` must be a dict")
+    if not isinstance(max_retries, int):
+        raise TypeError("`max_retries` must be an integer")
+    if not isinstance(retry_delay, int):
+        raise TypeError("`retry_delay` must be an integer")
+
+    headers = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+    for attempt in range(max_retries):
+        try:
+            response = await client.get(url, headers=headers)
+            if response.status_code == 304:
+                return NOT_MODIFIED, validators
+            response.raise_for_status()  # Raise an exception for HTTP errors
+            new_validators = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+            return response.content, new_validators
+
+        except httpx.HTTPError as e:
+            logger.warning("Attempt %d failed for %s: %r", attempt + 1, url, e)
+
+            response = e.response if isinstance(e, httpx.HTTPStatusError) else None
+            if not is_retryable(response):
+                logger.error(
+                    "Not retrying HTTP %d for %s.", response.status_code, url
+                )
+                return None, None
+
+            if attempt < max_retries - 1:
+                wait_time = get_retry_wait_time(attempt, retry_delay, response)
+                logger.warning("Retrying in %.1f seconds...", wait_time)
+                await asyncio.sleep(wait_time)
+            else:
+                logger.error("Max retries reached. Failed to fetch the webpage.")
+                return None, None
+
+
+async def find_max_page(client, base_url, max_page):
     """
     Find the maximum page number for the politifact base URL.
 
+    The page count is bracketed by doubling the page number and then narrowed
+    down with a binary search, so only O(log(max_page)) pages are fetched.
+
     Parameters:
     ----------
+    - client (httpx.AsyncClient): The client used to fetch the pages.
     - base_url (str): The base URL used to construct the politifact URLs.
     - max_page (int): The maximum page number to search.
 
     Returns:
     ----------
-    - int: The maximum page number with politifact results.
+    - int: The maximum page number with politifact results (0 if none).
 
+    Exceptions
+    ----------
+    - RuntimeError: If a page cannot be fetched.
     """
-    no_results = True
-
-    while no_results and max_page > 0:
-        # Decrement max_page by 1
-        max_page -= 1
 
+    async def has_results(page_num):
         # Sleep for a bit to be nice to politifact
-        time.sleep(0.3 + random.random())
+        await asyncio.sleep(0.3 + random.random())
 
         # Construct the URL
-        url = f"{base_url}{max_page}"
+        url = f"{base_url}{page_num}"
 
         # Fetch the page
-        print(f"Trying: {url}")
-        response = fetch_url(url)
-        soup = BeautifulSoup(response.text, "html.parser")
+        logger.info("Trying: %s", url)
+        html, _ = await fetch_url_async(client, url)
+        if html is None:
+            raise RuntimeError(f"Failed to fetch {url}")
+        return not find_no_results(html)
+
+    # Invariant: `low` has results (or is 0) and `high` does not (or is past
+    # `max_page`), so the last page with results lies in [low, high).
+    low, high = 0, 1
+    while high <= max_page and await has_results(high):
+        low = high
+        high *= 2
+    high = min(high, max_page + 1)
 
-        # Once this returns False, we have found results, and should take
-        # this as our maximum page.
-        no_results = find_no_results(soup)
+    while high - low > 1:
+        mid = (low + high) // 2
+        if await has_results(mid):
+            low = mid
+        else:
+            high = mid
 
-    return max_page
+    return low
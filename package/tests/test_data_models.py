@@ -0,0 +1,35 @@
+"""
+Check that fact checks parsed with lxml match the records produced by the
+original BeautifulSoup parser.
+
+The expected values were produced by running the BeautifulSoup version of
+`PolitiFactCheck` on the same fixture page.
+"""
+import os
+
+from politifact_pkg import PolitiFactCheck
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "factcheck_page.html")
+LINK = "https://www.politifact.com/factchecks/2007/oct/02/mike-gravel/yes-in-theory-but-not-in-practice/"
+
+EXPECTED = {
+    "verdict": "false",
+    "statement": (
+        "                                    "
+        "“The Iraqi people — 70 percent of them — want us out.”"
+        "                                 He said & repeated it."
+    ),
+    "statement_originator": "Mike Gravel",
+    "statement_date": "September 26, 2007",
+    "factchecker_name": "\n                Bill  Adair\n            ",
+    "factcheck_date": "October 2, 2007",
+    "topics": "Iraq|\n                        Foreign Policy\n                    ",
+    "factcheck_analysis_link": LINK,
+}
+
+
+def test_matches_beautifulsoup_output():
+    with open(FIXTURE, "rb") as f:
+        record = PolitiFactCheck.from_html(f.read(), LINK)
+    record.pop("date_retrieved")
+    assert record == EXPECTED
@@ -16,17 +16,30 @@ Output: .parquet file with the below columns:
 
 Author: Matthew DeVerna
 """
-import json
+import asyncio
+import httpx
+import logging
+import orjson
 import os
 import random
-import time
+import sys
 
-import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from concurrent.futures import ProcessPoolExecutor
 
 from politifact_pkg import PolitiFactCheck
-from politifact_pkg.utils import fetch_url, find_max_page
+from politifact_pkg.utils import (
+    DEFAULT_HEADERS,
+    NOT_MODIFIED,
+    fetch_url_async,
+    find_max_page,
+)
 from politifact_pkg.parsing import extract_statement_links
 
+logger = logging.getLogger(__name__)
+
 #### IMPORTANT!!! ####
 # Set to some number that is higher than the number of pages of fact checks
 MAX_PAGE = 800
@@ -38,90 +51,343 @@ FC_LIST_URL = f"{POLITIFACT_BASE_URL}/factchecks/?page="
 # Output paths
 DATA_DIR = "../data"
 FC_CACHE = os.path.join(DATA_DIR, "factchecks_cache.json")
+FC_PROGRESS = f"{FC_CACHE}.progress"
 FC_PARQUET = os.path.join(DATA_DIR, "factchecks.parquet")
 MISSED_LINKS = os.path.join(DATA_DIR, "missed_factcheck_links.txt")
 
+# Number of fact checks per row group written to the .parquet file
+ROW_GROUP_SIZE = 5000
 
-if __name__ == "__main__":
-    print("Check if we already have cached fact checks...")
+# Columns of the output .parquet file. Any other cached fields are left out.
+FC_SCHEMA = pa.schema(
+    [
+        ("verdict", pa.string()),
+        ("statement", pa.string()),
+        ("statement_originator", pa.string()),
+        ("statement_date", pa.string()),
+        ("factchecker_name", pa.string()),
+        ("factcheck_date", pa.string()),
+        ("topics", pa.string()),
+        ("factcheck_analysis_link", pa.string()),
+        ("date_retrieved", pa.float64()),
+        ("page", pa.int64()),
+    ]
+)
+
+# Maximum number of fact check pages fetched at the same time
+MAX_CONCURRENT_REQUESTS = 10
+
+# Cached fact checks are skipped. Set to True to instead re-check them with
+# conditional requests, re-scraping only the ones that changed.
+REVALIDATE_CACHED = False
+
+
+async def bounded_fetch(client, semaphore, url, validators=None):
+    """
+    Fetch `url` while holding `semaphore`, limiting how many requests are in flight.
+    """
+    async with semaphore:
+        await asyncio.sleep(random.uniform(0.2, 0.5))  # Be nice.
+        return await fetch_url_async(client, url, validators=validators)
+
+
+def save_missed_link(link):
+    """
+    Append a fact check link that could not be scraped to the missed links file.
+    """
+    with open(MISSED_LINKS, "a") as mf:
+        mf.write(f"{link}\n")
+
+
+def read_cache():
+    """
+    Yield every fact check dict stored in the cache file.
+    """
+    with open(FC_CACHE, "rb") as f:
+        for line in f:
+            yield orjson.loads(line)
+
+
+def read_cache_reversed(chunk_size=1 << 20):
+    """
+    Yield every fact check dict stored in the cache file, newest first.
+
+    The file is read backwards in chunks, so the latest version of a fact check
+    is always seen before any older one.
+    """
+    with open(FC_CACHE, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b""
+        while position > 0:
+            read_size = min(chunk_size, position)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + remainder).split(b"\n")
+
+            # The first line may continue in the previous chunk
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line:
+                    yield orjson.loads(line)
+
+        if remainder:
+            yield orjson.loads(remainder)
+
+
+def load_validators():
+    """
+    Return a map of cached fact check links to their
+    {"etag": ..., "last_modified": ...} validators, by scanning the full cache.
+    """
+    validators = {}
+    logger.info("Loading cached fact check validators...")
+    for fc_dict in read_cache():
+        validators[fc_dict["factcheck_analysis_link"]] = {
+            "etag": fc_dict.get("etag"),
+            "last_modified": fc_dict.get("last_modified"),
+        }
+    return validators
+
+
+def load_progress():
+    """
+    Return the set of cached fact check links.
+
+    The progress file is an append-only log of links, one per line, extended
+    after every listing page that added fact checks. It is compacted here, or
+    rebuilt by scanning the full cache when it does not exist yet.
+    """
+    if os.path.exists(FC_PROGRESS):
+        logger.info("Loading scraping progress...")
+        with open(FC_PROGRESS, "r") as f:
+            # A crash may leave a truncated last line, which is not a full link
+            links = {line[:-1] for line in f if line.endswith("\n")}
+    else:
+        logger.info("Loading cached fact checks...")
+        links = {fc_dict["factcheck_analysis_link"] for fc_dict in read_cache()}
+
+    tmp_file = f"{FC_PROGRESS}.tmp"
+    with open(tmp_file, "w") as f:
+        f.writelines(f"{link}\n" for link in links)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, FC_PROGRESS)
+
+    return links
 
-    fact_checks = []  # Will store fact checks here for .parquet file
-    page_num = 1  # Counter for pages
+
+def write_parquet():
+    """
+    Stream the cached fact checks into the .parquet file one row group at a time,
+    so memory use does not grow with the number of fact checks.
+
+    Revalidated fact checks are cached again, so only the latest version of
+    each is kept. The cache is read once, newest first, so rows are written in
+    reverse cache order. Returns the number of rows written.
+    """
+    num_rows = 0
+    batch = []
+    seen_links = set()
+    with pq.ParquetWriter(FC_PARQUET, FC_SCHEMA, compression="zstd") as writer:
+        for fc_dict in read_cache_reversed():
+            link = fc_dict["factcheck_analysis_link"]
+            if link in seen_links:
+                continue
+            seen_links.add(link)
+
+            batch.append(fc_dict)
+            if len(batch) == ROW_GROUP_SIZE:
+                writer.write_table(pa.Table.from_pylist(batch, schema=FC_SCHEMA))
+                num_rows += len(batch)
+                batch = []
+
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=FC_SCHEMA))
+            num_rows += len(batch)
+
+    return num_rows
+
+
+async def main():
+    logger.info("Check if we already have cached fact checks...")
+
+    seen_links = set()  # Links of every cached fact check
+    validators = {}  # Map fact check links -> {"etag": ..., "last_modified": ...}
     if os.path.exists(FC_CACHE):
-        print("Loading cached fact checks...")
-        with open(FC_CACHE, "r") as f:
-            for line in f:
-                fc_dict = json.loads(line)
-                fact_checks.append(fc_dict)
-                page_num = max(page_num, fc_dict["page"])
-
-    print(f"\t- Found {len(fact_checks)} fact checks.")
-
-    print("Finding the maximum page number...")
-    max_page = find_max_page(base_url=FC_LIST_URL, max_page=MAX_PAGE)
-    print(f"\t- Found max page: {max_page}")
-
-    print("Begin scraping new fact checks...")
-    with open(FC_CACHE, "a") as f:
-        for page_num in range(1, max_page + 1):
-            print(f"Fetching page {page_num}...")
-            page_url = f"{FC_LIST_URL}{page_num}"
-
-            # Keep trying more politifact pages until we get a None, meaning we've
-            # reached the end of the list of fact-checks of we are running into other errors.
-            response = fetch_url(page_url)
-            if response is None:
-                print("Failed to fetch page.")
-                print(f"\t- {page_url}")
-                print("BREAKING SCRIPT.")
-                break
-
-            print(f"\t- Parsing fact checks...")
-            statement_links = extract_statement_links(response, FC_LIST_URL)
-            print(f"\t- Found {len(statement_links)} links.")
-
-            for idx, link in enumerate(statement_links, start=1):
-                full_url = f"{POLITIFACT_BASE_URL}{link}"
-                time.sleep(0.5 + random.random())  # Be nice.
-
-                try:
-                    print(f"\t- {idx}. Fetching {full_url}")
-                    response = fetch_url(full_url)
-
-                    # This class automatically extracts the relvant information
-                    # see the data_models.py file for details
-                    fc = PolitiFactCheck(response=response, link=full_url)
-
-                except Exception as e:
-                    print(f"\t- Failed. Saving to missed file.")
-                    print(e)
-                    with open(MISSED_LINKS, "a") as mf:
-                        mf.write(f"{full_url}\n")
-                    continue
+        seen_links = load_progress()
+        if REVALIDATE_CACHED:
+            # Only needed for conditional requests, so not kept in the progress file
+            validators = load_validators()
+    elif os.path.exists(FC_PROGRESS):
+        # Links logged for a cache that no longer exists are stale
+        os.remove(FC_PROGRESS)
+
+    logger.info("\t- Found %d fact checks.", len(seen_links))
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    # A single HTTP/2 client fetches the listing pages and multiplexes all
+    # concurrent fact check requests over one connection to politifact.com for
+    # the whole run. The connection is kept alive between requests, so the host
+    # is resolved and the TLS handshake done only once, and binding to an IPv4
+    # address avoids dual-stack timeouts.
+    limits = httpx.Limits(
+        max_connections=20, max_keepalive_connections=10, keepalive_expiry=60
+    )
+    transport = httpx.AsyncHTTPTransport(
+        http2=True, limits=limits, local_address="0.0.0.0"
+    )
+    # Unlike requests, httpx does not follow redirects unless asked to
+    async with httpx.AsyncClient(
+        transport=transport,
+        timeout=30.0,
+        headers=DEFAULT_HEADERS,
+        follow_redirects=True,
+    ) as client:
+        logger.info("Finding the maximum page number...")
+        max_page = await find_max_page(client, base_url=FC_LIST_URL, max_page=MAX_PAGE)
+        logger.info("\t- Found max page: %d", max_page)
+
+        logger.info("Begin scraping new fact checks...")
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as process_pool, open(
+            FC_CACHE, "ab", buffering=1 << 16
+        ) as f, open(FC_PROGRESS, "a") as progress_f:
+            # Always start from the first page. New fact checks push older ones
+            # onto later pages, and cached links are skipped without a request.
+            for page_num in range(1, max_page + 1):
+                logger.info("Fetching page %d...", page_num)
+                page_url = f"{FC_LIST_URL}{page_num}"
 
-                print(f"\t\t- Success.")
+                # Cached links are skipped without a request, so space out the
+                # listing pages themselves as well
+                await asyncio.sleep(0.3 + random.random())  # Be nice.
 
-                # Extract all of the properties into a dict
-                fc_dict = {
-                    key: value
-                    for key, value in vars(fc).items()
-                    if not key.startswith("_")
-                }
+                # Keep trying more politifact pages until we get a None, meaning we've
+                # reached the end of the list of fact-checks of we are running into other errors.
+                page_html, _ = await fetch_url_async(client, page_url)
+                if page_html is None:
+                    logger.error(
+                        "Failed to fetch page %s. BREAKING SCRIPT.", page_url
+                    )
+                    break
 
-                fc_dict["page"] = page_num
+                logger.debug("\t- Parsing fact checks...")
+                statement_links = extract_statement_links(page_html)
+                logger.info("\t- Found %d links.", len(statement_links))
 
-                # Store the fact checks in a .json file incase the script is broken
-                f.write(json.dumps(fc_dict) + "\n")
+                # Number links by their position on the listing page
+                full_urls = [
+                    (idx, f"{POLITIFACT_BASE_URL}{link}")
+                    for idx, link in enumerate(statement_links, start=1)
+                ]
+                if not REVALIDATE_CACHED:
+                    full_urls = [
+                        (idx, url) for idx, url in full_urls if url not in seen_links
+                    ]
+                    skipped = len(statement_links) - len(full_urls)
+                    logger.info("\t- Skipping %d already cached links.", skipped)
+                results = await asyncio.gather(
+                    *[
+                        bounded_fetch(client, semaphore, url, validators.get(url))
+                        for _, url in full_urls
+                    ],
+                    return_exceptions=True,
+                )
 
-                fact_checks.append(fc_dict)
+                to_parse = []
+                for (idx, full_url), result in zip(full_urls, results):
+                    # One bad link (e.g. an invalid URL) must not end the scrape
+                    if isinstance(result, Exception):
+                        logger.warning(
+                            "\t- %d. Failed to fetch %s. Saving to missed file: %r",
+                            idx,
+                            full_url,
+                            result,
+                        )
+                        save_missed_link(full_url)
+                        continue
 
-    fc_df = pd.DataFrame.from_records(fact_checks)
+                    html, fc_validators = result
+                    if html is NOT_MODIFIED:
+                        # The cached fact check is still up to date
+                        logger.debug(
+                            "\t- %d. Not modified, keeping cached %s", idx, full_url
+                        )
+                    elif html is None:
+                        logger.warning(
+                            "\t- %d. Failed to fetch %s. Saving to missed file.",
+                            idx,
+                            full_url,
+                        )
+                        save_missed_link(full_url)
+                    else:
+                        to_parse.append((idx, full_url, html, fc_validators))
 
-    # The caching procedure will create duplicates so we drop them here
-    fc_df.drop_duplicates(inplace=True)
-    fc_df.to_parquet(FC_PARQUET)
+                # Parse the pages in parallel across processes. This class
+                # automatically extracts the relvant information into a dict,
+                # see the data_models.py file for details
+                fc_dicts = await asyncio.gather(
+                    *[
+                        loop.run_in_executor(
+                            process_pool, PolitiFactCheck.from_html, html, full_url
+                        )
+                        for _, full_url, html, _ in to_parse
+                    ],
+                    return_exceptions=True,
+                )
+
+                page_buf = bytearray()
+                page_links = []
+                for (idx, full_url, _, fc_validators), fc_dict in zip(
+                    to_parse, fc_dicts
+                ):
+                    if isinstance(fc_dict, Exception):
+                        logger.warning(
+                            "\t- %d. Failed to parse %s. Saving to missed file: %s",
+                            idx,
+                            full_url,
+                            fc_dict,
+                        )
+                        save_missed_link(full_url)
+                        continue
+
+                    logger.debug("\t- %d. Parsed %s", idx, full_url)
+
+                    fc_dict["page"] = page_num
+                    fc_dict.update(fc_validators)
+                    validators[full_url] = fc_validators
+                    seen_links.add(full_url)
+                    page_links.append(full_url)
+
+                    page_buf += orjson.dumps(fc_dict)
+                    page_buf += b"\n"
+
+                if not page_buf:
+                    continue
+
+                # Store the page's fact checks in a .json file incase the script is
+                # broken, with a single write. Sync it to disk before the progress
+                # file records the page's links as cached.
+                f.write(page_buf)
+                f.flush()
+                os.fsync(f.fileno())
+                progress_f.writelines(f"{link}\n" for link in page_links)
+                progress_f.flush()
+                os.fsync(progress_f.fileno())
+
+    # The cache holds every fact check, including those from earlier runs
+    logger.info("Building the .parquet file from the cache...")
+    num_fact_checks = write_parquet()
 
     # Provide some stats
-    print(f"Scraped {len(fc_df)} fact checks.")
+    logger.info("Scraped %d fact checks.", num_fact_checks)
+
+    logger.info("--- Scraping complete ---")
 
-    print("--- Scraping complete ---")
+
+if __name__ == "__main__":
+    # Per fact check messages are logged at the DEBUG level
+    logging.basicConfig(
+        level=logging.INFO, stream=sys.stdout, format="%(asctime)s %(message)s"
+    )
+    asyncio.run(main())
@@ -8,8 +8,10 @@ Output: .parquet file like that created with `scrape_politifact_all.py`
 Author: Matthew DeVerna
 """
 import json
+import logging
 import os
 import random
+import sys
 import time
 
 import pandas as pd
@@ -17,6 +19,8 @@ import pandas as pd
 from politifact_pkg import PolitiFactCheck
 from politifact_pkg.utils import fetch_url
 
+logger = logging.getLogger(__name__)
+
 # Politifact URLS
 POLITIFACT_BASE_URL = "https://www.politifact.com"
 FC_LIST_URL = f"{POLITIFACT_BASE_URL}/factchecks/?page="
@@ -29,6 +33,11 @@ MISSED_LINKS = os.path.join(DATA_DIR, "missed_factcheck_links.txt")
 
 
 if __name__ == "__main__":
+    # Per fact check messages are logged at the DEBUG level
+    logging.basicConfig(
+        level=logging.INFO, stream=sys.stdout, format="%(asctime)s %(message)s"
+    )
+
     # Read all of the missed links into a list
     all_links = []
     with open(MISSED_LINKS, "r") as f:
@@ -36,32 +45,26 @@ if __name__ == "__main__":
             all_links.append(line.strip())
 
     # Fetch all of the links
-    print("Fetching all of the links...")
+    logger.info("Fetching all of the links...")
     fact_checks = []
     with open(FC_CACHE, "a") as f:
         for link in all_links:
-            print(f"\t- {link}")
+            logger.debug("\t- %s", link)
             try:
                 time.sleep(0.5 + random.random())  # Be nice.
                 response = fetch_url(link)
-                fc = PolitiFactCheck(response=response, link=link)
-                fc_dict = {
-                    key: value
-                    for key, value in vars(fc).items()
-                    if not key.startswith("_")
-                }
+                fc_dict = PolitiFactCheck.from_html(response.content, link)
                 fc_dict["page"] = -1  # Mark -1 to indicate that we don't know the page
                 fact_checks.append(fc_dict)
                 f.write(json.dumps(fc_dict) + "\n")
             except Exception as e:
-                print(f"\t- Failed link: {link}")
-                print(e)
+                logger.warning("\t- Failed link: %s: %s", link, e)
 
     # Create a dataframe and save as parquet
     fc_df = pd.DataFrame.from_records(fact_checks)
     fc_df.to_parquet(FC_PARQUET)
 
     # Provide some stats
-    print(f"Scraped {len(fc_df)} fact checks.")
+    logger.info("Scraped %d fact checks.", len(fc_df))
 
-    print("--- Scraping complete ---")
+    logger.info("--- Scraping complete ---")